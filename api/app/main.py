@@ -1,27 +1,95 @@
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import PlainTextResponse, JSONResponse, HTMLResponse
-from rdflib import Graph
+from fastapi.responses import Response, HTMLResponse, StreamingResponse
+from rdflib import Graph, URIRef, BNode
+from email.utils import formatdate
+from functools import lru_cache
+from html import escape
+from typing import List, Optional, Tuple
+import hashlib
 import os
 
 BASE_URI = "https://kg-football.vn/"
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../gold/ttl"))
 ONTOLOGY_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../ontology/core.ttl"))
+MEDIA_TYPES = {"turtle": "text/turtle", "json-ld": "application/ld+json"}
 
 app = FastAPI(title="KG Football Dereferenceable API")
 
 
+# gold dumps are N-Triples; hand-written snippets may still be Turtle
+DATA_FORMATS = {".ttl": "turtle", ".nt": "nt"}
+
+
+def data_files() -> List[Tuple[str, str]]:
+	"""(path, rdflib format) for every gold data file."""
+	if not os.path.isdir(DATA_DIR):
+		return []
+	files = []
+	for fn in sorted(os.listdir(DATA_DIR)):
+		fmt = DATA_FORMATS.get(os.path.splitext(fn)[1])
+		if fmt:
+			files.append((os.path.join(DATA_DIR, fn), fmt))
+	return files
+
+
 def load_graph() -> Graph:
 	g = Graph()
 	if os.path.exists(ONTOLOGY_FILE):
 		g.parse(ONTOLOGY_FILE, format="turtle")
-	# load gold ttl snippets
-	if os.path.isdir(DATA_DIR):
-		for fn in os.listdir(DATA_DIR):
-			if fn.endswith(".ttl"):
-				g.parse(os.path.join(DATA_DIR, fn), format="turtle")
+	for path, fmt in data_files():
+		g.parse(path, format=fmt)
 	return g
 
 
+def data_mtime() -> float:
+	"""Latest modification time over the ontology and gold data files."""
+	paths = [ONTOLOGY_FILE] + [path for path, _ in data_files()]
+	return max((os.path.getmtime(p) for p in paths if os.path.exists(p)), default=0.0)
+
+
+def rebuild_graph() -> None:
+	app.state.graph_mtime = data_mtime()
+	app.state.graph = load_graph()
+	render.cache_clear()
+
+
+@app.on_event("startup")
+def startup() -> None:
+	rebuild_graph()
+
+
+def get_graph(request: Request) -> Graph:
+	# reparse only when a ttl file changed since the last build
+	if data_mtime() != request.app.state.graph_mtime:
+		rebuild_graph()
+	return request.app.state.graph
+
+
+def describe(g: Graph, iri: str) -> Graph:
+	"""Triples about iri plus one more hop through its resource objects."""
+	cg = Graph()
+	subj = URIRef(iri)
+	for p, o in g.predicate_objects(subj):
+		cg.add((subj, p, o))
+		if isinstance(o, (URIRef, BNode)):
+			for p2, o2 in g.predicate_objects(o):
+				cg.add((o, p2, o2))
+	return cg
+
+
+@lru_cache(maxsize=4096)
+def render(iri: str, fmt: str) -> Optional[Tuple[bytes, str]]:
+	"""Serialized description of iri and its ETag, None if unknown."""
+	cg = describe(app.state.graph, iri)
+	if len(cg) == 0:
+		return None
+	if fmt == "json-ld":
+		body = cg.serialize(format="json-ld", indent=2, encoding="utf-8")
+	else:
+		body = cg.serialize(format=fmt, encoding="utf-8")
+	return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
 def negotiate(request: Request) -> str:
 	accept = request.headers.get("accept", "")
 	if "text/turtle" in accept:
@@ -35,44 +103,54 @@ def negotiate(request: Request) -> str:
 async def deref_resource(path: str, request: Request):
 	iri = f"{BASE_URI}resource/{path}"
 	fmt = negotiate(request)
-	g = load_graph()
-	q = f"""
-	CONSTRUCT {{ <{iri}> ?p ?o . ?o ?p2 ?o2 }}
-	WHERE {{
-	  OPTIONAL {{ <{iri}> ?p ?o . OPTIONAL {{ ?o ?p2 ?o2 }} }}
-	}}
-	"""
-	cg = g.query(q).graph
+	g = get_graph(request)
+	if fmt in MEDIA_TYPES:
+		cached = render(iri, fmt)
+		if cached is None:
+			raise HTTPException(status_code=404, detail="Resource not found")
+		body, etag = cached
+		headers = {
+			# same URL, different body per Accept: caches must key on it
+			"Vary": "Accept",
+			"ETag": etag,
+			"Last-Modified": formatdate(request.app.state.graph_mtime, usegmt=True),
+		}
+		if etag in request.headers.get("if-none-match", ""):
+			return Response(status_code=304, headers=headers)
+		return Response(content=body, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+	cg = describe(g, iri)
 	if len(cg) == 0:
 		raise HTTPException(status_code=404, detail="Resource not found")
 
-	if fmt == "turtle":
-		return PlainTextResponse(cg.serialize(format="turtle"), media_type="text/turtle")
-	if fmt == "json-ld":
-		return JSONResponse(content=cg.serialize(format="json-ld", indent=2).decode("utf-8"))
+	# HTML view minimal, rows are streamed while walking the graph
+	title = escape(iri)
 
-	# HTML view minimal
-	triples = "".join([f"<tr><td>{s}</td><td>{p}</td><td>{o}</td></tr>" for s,p,o in cg])
-	html = f"""
-	<html><head><title>{iri}</title></head>
+	async def rows():
+		yield f"""
+	<html><head><title>{title}</title></head>
 	<body>
-	  <h1>{iri}</h1>
+	  <h1>{title}</h1>
 	  <p>Content negotiation: text/turtle, application/ld+json, text/html</p>
 	  <table border=\"1\"><thead><tr><th>S</th><th>P</th><th>O</th></tr></thead>
-	  <tbody>{triples}</tbody></table>
+	  <tbody>"""
+		for s, p, o in cg:
+			yield f"<tr><td>{escape(s)}</td><td>{escape(p)}</td><td>{escape(o)}</td></tr>"
+		yield """</tbody></table>
 	</body></html>
 	"""
-	return HTMLResponse(content=html)
+
+	return StreamingResponse(rows(), media_type="text/html", headers={"Vary": "Accept"})
 
 
 @app.get("/page/resource/{path:path}")
 async def human_page(path: str):
-	iri = f"{BASE_URI}resource/{path}"
+	iri = escape(f"{BASE_URI}resource/{path}")
 	html = f"""
 	<html><head><title>{iri}</title></head>
 	<body>
 	  <h1>{iri}</h1>
-	  <p>Trang mô tả tài nguyên. Vui lòng truy cập <code>/resource/{path}</code> để nhận Turtle/JSON-LD.</p>
+	  <p>Trang mô tả tài nguyên. Vui lòng truy cập <code>/resource/{escape(path)}</code> để nhận Turtle/JSON-LD.</p>
 	  <p>Ontology: <a href=\"https://kg-football.vn/ontology#\">kg-football.vn/ontology#</a></p>
 	</body></html>
 	"""
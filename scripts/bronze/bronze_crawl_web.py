@@ -1,26 +1,46 @@
 #!/usr/bin/env python3
 import os
 import re
+import math
 import time
+import random
+import gzip
+import hashlib
 import argparse
+import asyncio
 import json
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from email.utils import parsedate_to_datetime
 from urllib.parse import urljoin, urlparse
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 from tqdm import tqdm
-from collections import deque
 from urllib import robotparser
 
 RAW_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../bronze/raw_web"))
+STORE_FILE = os.path.join(RAW_DIR, "..", "web_crawl.sqlite")
+# legacy plain-text log, imported into STORE_FILE on first run
 DONE_FILE = os.path.join(RAW_DIR, "..", "web_done.txt")
-ERROR_FILE = os.path.join(RAW_DIR, "..", "web_error.txt")
 
 DEFAULT_MAX_PAGES = 5000
 DEFAULT_DELAY = 0.1
+DEFAULT_BURST = 1
 DEFAULT_DEPTH = 2
 DEFAULT_TIMEOUT = 10
+DEFAULT_CONCURRENCY = 8
+DEFAULT_HOST_CONCURRENCY = 4
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 1.0
+MAX_BACKOFF = 30.0
+MAX_RETRY_AFTER = 120.0
+ROBOTS_TTL = 12 * 3600
+COMMIT_EVERY = 500
+COMMIT_INTERVAL = 2.0
+BLOOM_ERROR_RATE = 1e-4
+FRONTIER_BUFFER = 256
+SUCCESS_STREAK = 10
 
 # Có thể thay seeds qua CLI
 SEED_HOSTS = {
@@ -41,6 +61,7 @@ USER_AGENT = (
     "KG-Football-WebBot/0.1 (+https://kg-football.vn; contact=admin@kg-football.vn)"
 )
 RETRYABLE_STATUS = {403, 408, 429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
 
 FOOTBALL_URL_KEYWORDS = [
     "bongda",
@@ -77,26 +98,154 @@ FOOTBALL_URL_KEYWORDS = [
     "huan-luyen-vien",
     "huanluyenvien",
 ]
+# one pass over the url instead of one substring scan per keyword
+_KW_RE = re.compile("|".join(re.escape(k) for k in FOOTBALL_URL_KEYWORDS))
+_SAFE_RE = re.compile(r"[^a-zA-Z0-9._-]")
+# links to files rather than pages, rejected before the keyword scan
+_ASSET_SUFFIXES = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".ico",
+    ".css", ".js", ".pdf", ".zip", ".rar", ".mp3", ".mp4", ".xml",
+)
+# readable part of page file names; the blake2b suffix keeps them unique
+SAFE_PREFIX_LEN = 80
+# raw html is kept gzipped; level 6 is faster than gzip's default 9 at ~1% larger files
+HTML_GZIP_LEVEL = 6
 
 
-def get_session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update(
-        {
+def get_session(timeout: int) -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        headers={
             "User-Agent": USER_AGENT,
             "Accept": "text/html,application/xhtml+xml",
             "Accept-Language": "vi, en;q=0.8",
-        }
-    )
-    retry = Retry(
-        total=3,
-        backoff_factor=1.0,
-        status_forcelist=list(RETRYABLE_STATUS),
-        allowed_methods=["GET"],
+        },
+        timeout=aiohttp.ClientTimeout(total=timeout),
     )
-    s.mount("http://", HTTPAdapter(max_retries=retry))
-    s.mount("https://", HTTPAdapter(max_retries=retry))
-    return s
+
+
+def retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value)))
+    except ValueError:
+        pass
+    try:
+        wait = parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+    return min(MAX_RETRY_AFTER, max(0.0, wait))
+
+
+class HostLimit:
+    """AIMD cap on in-flight requests to one host.
+
+    The cap grows by one after SUCCESS_STREAK consecutive 2xx responses and is
+    halved on 429/503, which also pauses the host for its Retry-After.
+    """
+
+    def __init__(self, ceiling: int):
+        self.limit = 1
+        self.ceiling = max(1, ceiling)
+        self.in_flight = 0
+        self.streak = 0
+        self.blocked_until = 0.0
+        self.cond = asyncio.Condition()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pause = self.blocked_until - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            async with self.cond:
+                await self.cond.wait_for(lambda: self.in_flight < self.limit)
+                # a 429/503 may have paused the host while this request was waiting
+                if self.blocked_until > loop.time():
+                    continue
+                self.in_flight += 1
+                return
+
+    async def release(self, status, retry_after=None):
+        async with self.cond:
+            self.in_flight -= 1
+            if status in THROTTLE_STATUS:
+                self.limit = max(1, self.limit // 2)
+                self.streak = 0
+                if retry_after:
+                    loop = asyncio.get_running_loop()
+                    self.blocked_until = max(
+                        self.blocked_until, loop.time() + retry_after
+                    )
+            elif status is not None and 200 <= status < 300:
+                self.streak += 1
+                if self.streak >= SUCCESS_STREAK:
+                    self.limit = min(self.ceiling, self.limit + 1)
+                    self.streak = 0
+            self.cond.notify_all()
+
+
+def backoff_delay(attempt: int) -> float:
+    # capped exponential backoff plus jitter so throttled workers don't retry in lockstep
+    return min(MAX_BACKOFF, BACKOFF_FACTOR * 2**attempt) + random.uniform(0, BACKOFF_FACTOR)
+
+
+async def fetch(
+    session: aiohttp.ClientSession,
+    url: str,
+    limit: HostLimit,
+    bucket: "TokenBucket" = None,
+) -> str:
+    attempt = 0
+    while True:
+        # retries spend a token too, so --delay also holds between attempts
+        if bucket is not None:
+            await bucket.acquire()
+        await limit.acquire()
+        status = None
+        retry_after = None
+        try:
+            async with session.get(url) as r:
+                status = r.status
+                if r.status not in RETRYABLE_STATUS or attempt >= MAX_RETRIES:
+                    r.raise_for_status()
+                    return await r.text(errors="replace")
+                if r.status in THROTTLE_STATUS:
+                    retry_after = retry_after_seconds(r.headers.get("Retry-After"))
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt >= MAX_RETRIES:
+                raise
+        finally:
+            await limit.release(status, retry_after)
+        await asyncio.sleep(retry_after or backoff_delay(attempt))
+        attempt += 1
+
+
+class TokenBucket:
+    """Per-host rate limit: `rate` requests per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = None
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            while True:
+                now = loop.time()
+                if self.updated is not None:
+                    self.tokens = min(
+                        self.capacity, self.tokens + (now - self.updated) * self.rate
+                    )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
 
 def normalize_url(base: str, link: str) -> str:
@@ -110,45 +259,92 @@ def normalize_url(base: str, link: str) -> str:
         return ""
 
 
-def allowed_by_robots(url: str, rp_cache: dict):
-    parsed = urlparse(url)
-    robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-    if robots_url not in rp_cache:
-        rp = robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        try:
-            resp = requests.get(robots_url, headers={"User-Agent": USER_AGENT}, timeout=5)
-            if resp.status_code >= 400:
-                rp_cache[robots_url] = None
-                return True, f"robots_http_{resp.status_code}:{robots_url}"
-            content = resp.text
-            rp.parse(content.splitlines())
-            rp_cache[robots_url] = rp
-        except Exception:
-            rp_cache[robots_url] = None
-            return True, f"robots_read_failed:{robots_url}"
-    rpp = rp_cache.get(robots_url)
-    if rpp is None:
-        return True, f"robots_unavailable:{robots_url}"
-    can = rpp.can_fetch(USER_AGENT, url)
-    return (True, "") if can else (False, "robots_disallow")
+class RobotsCache:
+    """robots.txt parsers per origin, refetched once older than `ttl` seconds.
+
+    Each origin is fetched by a single shared task: the first URL of an
+    unknown host waits for it, a stale entry keeps answering while the
+    refresh runs in the background.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, ttl: float = ROBOTS_TTL):
+        self.session = session
+        self.ttl = ttl
+        self.entries = {}  # robots_url -> (parser or None, fetched_at)
+        self.pending = {}  # robots_url -> asyncio.Task
 
+    @staticmethod
+    def robots_url(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}/robots.txt"
 
-def save_page(url: str, html: str, text: str):
+    async def _fetch(self, robots_url: str):
+        rp = None
+        try:
+            async with self.session.get(
+                robots_url, timeout=aiohttp.ClientTimeout(total=5)
+            ) as resp:
+                if resp.status < 400:
+                    rp = robotparser.RobotFileParser()
+                    rp.set_url(robots_url)
+                    rp.parse((await resp.text(errors="replace")).splitlines())
+        except Exception:
+            rp = None
+        self.entries[robots_url] = (rp, time.monotonic())
+        self.pending.pop(robots_url, None)
+
+    def _refresh(self, robots_url: str) -> asyncio.Task:
+        # no await between the lookup and the insert, so one task per origin
+        task = self.pending.get(robots_url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(robots_url))
+            self.pending[robots_url] = task
+        return task
+
+    async def prefetch(self, urls):
+        await asyncio.gather(*(self._refresh(u) for u in {self.robots_url(x) for x in urls}))
+
+    async def close(self):
+        tasks = list(self.pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def allowed(self, url: str):
+        robots_url = self.robots_url(url)
+        entry = self.entries.get(robots_url)
+        if entry is None:
+            await asyncio.shield(self._refresh(robots_url))
+            entry = self.entries[robots_url]
+        elif time.monotonic() - entry[1] > self.ttl:
+            self._refresh(robots_url)
+        rp = entry[0]
+        if rp is None:
+            return True, f"robots_unavailable:{robots_url}"
+        can = rp.can_fetch(USER_AGENT, url)
+        return (True, "") if can else (False, "robots_disallow")
+
+
+def page_name(url: str) -> str:
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=12).hexdigest()
+    return f"page_{_SAFE_RE.sub('_', url)[:SAFE_PREFIX_LEN]}_{digest}"
+
+
+def save_page(url: str, html: str, text: str) -> str:
     os.makedirs(RAW_DIR, exist_ok=True)
-    safe_path = re.sub(r"[^a-zA-Z0-9._-]", "_", url)
-    base = os.path.join(RAW_DIR, f"page_{safe_path}")
+    base = os.path.join(RAW_DIR, page_name(url))
     with open(base + ".json", "w", encoding="utf-8") as f:
         json.dump(
-            {"url": url, "html_file": base + ".html", "text_file": base + ".txt"},
+            {"url": url, "html_file": base + ".html.gz", "text_file": base + ".txt"},
             f,
             ensure_ascii=False,
-            indent=2,
+            separators=(",", ":"),
         )
-    with open(base + ".html", "w", encoding="utf-8") as f:
-        f.write(html)
+    with gzip.open(base + ".html.gz", "wb", compresslevel=HTML_GZIP_LEVEL) as f:
+        f.write(html.encode("utf-8"))
     with open(base + ".txt", "w", encoding="utf-8") as f:
         f.write(text)
+    return base
 
 
 def is_footballish_url(url: str, seed_hosts: set = SEED_HOSTS) -> bool:
@@ -157,14 +353,15 @@ def is_footballish_url(url: str, seed_hosts: set = SEED_HOSTS) -> bool:
     # if host in seed_hosts:
     #     return True
     lu = url.lower()
-    return any(k in lu for k in FOOTBALL_URL_KEYWORDS)
+    if lu.split("?", 1)[0].endswith(_ASSET_SUFFIXES):
+        return False
+    return _KW_RE.search(lu) is not None
 
 
-def extract_links(url: str, html: str, seed_hosts: set = SEED_HOSTS) -> list:
+def extract_links(url: str, tree: LexborHTMLParser, seed_hosts: set = SEED_HOSTS) -> list:
     out = []
-    soup = BeautifulSoup(html, "html.parser")
-    for a in soup.find_all("a", href=True):
-        u = normalize_url(url, a["href"])
+    for a in tree.css("a[href]"):
+        u = normalize_url(url, a.attributes.get("href") or "")
         if not u:
             continue
         if not is_footballish_url(u, seed_hosts):
@@ -173,60 +370,276 @@ def extract_links(url: str, html: str, seed_hosts: set = SEED_HOSTS) -> list:
     return out
 
 
-def clean_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    return soup.get_text(" ", strip=True)
-
+def clean_text(tree: LexborHTMLParser) -> str:
+    # strips script/style in place, call after extract_links
+    tree.strip_tags(["script", "style", "noscript"])
+    if tree.root is None:
+        return ""
+    return " ".join(tree.root.text(separator=" ").split())
+
+
+def process_page(url: str, html: str, seed_hosts: set, follow: bool):
+    """Parse, extract and save one page; runs in the parse process pool."""
+    tree = LexborHTMLParser(html)
+    links = extract_links(url, tree, seed_hosts) if follow else []
+    text = clean_text(tree)
+    return save_page(url, html, text), links
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, sized for `capacity` items."""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class CrawlStore:
+    """Crawl state in SQLite (WAL), committed in batches.
+
+    Holds the BFS frontier, visited URLs, saved page files and errors, so an
+    interrupted crawl resumes where it stopped. Writes are committed every
+    COMMIT_EVERY statements or COMMIT_INTERVAL seconds, whichever comes first.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS errors (url TEXT, ts REAL, reason TEXT);
+            CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, file TEXT);
+            CREATE TABLE IF NOT EXISTS frontier (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT UNIQUE,
+                depth INTEGER
+            );
+            """
+        )
+        self.pending = 0
+        self.last_commit = time.monotonic()
+
+    def import_done_file(self, path: str):
+        if not os.path.exists(path):
+            return
+        if self.conn.execute("SELECT 1 FROM visited LIMIT 1").fetchone():
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO visited (url) VALUES (?)",
+                ((line.strip(),) for line in f if line.strip()),
+            )
+        self.commit()
+
+    def push(self, url: str, depth: int):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO frontier (url, depth) SELECT ?, ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM visited WHERE url = ?)",
+            (url, depth, url),
+        )
+        self._tick()
+
+    def frontier_after(self, last_id: int, limit: int) -> list:
+        # ids only grow (AUTOINCREMENT), so id order is BFS order
+        return self.conn.execute(
+            "SELECT id, url, depth FROM frontier WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, limit),
+        ).fetchall()
+
+    def drop(self, url: str):
+        self.conn.execute("DELETE FROM frontier WHERE url = ?", (url,))
+        self._tick()
+
+    def mark_done(self, url: str, file: str):
+        self.conn.execute("INSERT OR IGNORE INTO visited (url) VALUES (?)", (url,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages (url, file) VALUES (?, ?)", (url, file)
+        )
+        self._tick()
 
-def run(seeds: list, max_pages: int, max_depth: int, delay: float, timeout: int):
-    session = get_session()
-    rp_cache = {}
+    def log_error(self, url: str, reason):
+        self.conn.execute(
+            "INSERT INTO errors (url, ts, reason) VALUES (?, ?, ?)",
+            (url, time.time(), str(reason)),
+        )
+        self._tick()
+
+    def _tick(self):
+        self.pending += 1
+        if (
+            self.pending >= COMMIT_EVERY
+            or time.monotonic() - self.last_commit >= COMMIT_INTERVAL
+        ):
+            self.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+        self.last_commit = time.monotonic()
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+
+async def crawl(
+    seeds: list,
+    max_pages: int,
+    max_depth: int,
+    delay: float,
+    timeout: int,
+    concurrency: int,
+    host_concurrency: int,
+    burst: int,
+):
+    # hosts are rate limited independently, so a slow host never holds up others
+    rate = 1.0 / delay if delay > 0 else None
+    buckets = {}
+    limits = {}
+
+    store = CrawlStore(STORE_FILE)
+    store.import_done_file(DONE_FILE)
+
+    # the frontier table dedupes exactly against itself and visited; the bloom
+    # filter only saves the SQL round trip for links seen earlier in this run
+    seen = BloomFilter(max_pages * 10)
+    results = 0
+    queue = asyncio.Queue(maxsize=FRONTIER_BUFFER)
 
-    done = set()
-    if os.path.exists(DONE_FILE):
-        with open(DONE_FILE, "r", encoding="utf-8") as f:
-            done = set(line.strip() for line in f if line.strip())
+    def enqueue(url: str, depth: int):
+        if url in seen:
+            return
+        seen.add(url)
+        store.push(url, depth)
 
-    results = 0
-    queue = deque([(s, 0) for s in seeds])
-    visited = set(done)
+    for s in seeds:
+        enqueue(s, 0)
     seed_hosts = {urlparse(s).netloc for s in seeds}
 
-    with tqdm(total=max_pages, desc="Crawling Web BFS") as pbar:
-        while queue and results < max_pages:
-            url, depth = queue.popleft()
-            if url in visited:
-                continue
-            visited.add(url)
-
+    async def visit(session, robots, pool, url: str, depth: int, pbar) -> bool:
+        # False only when the page was fetched but not kept because max_pages
+        # was reached meanwhile; the url then has to stay in the frontier
+        nonlocal results
+        try:
+            allowed, reason = await robots.allowed(url)
+            if not allowed:
+                store.log_error(url, reason)
+                return True
+            host = urlparse(url).netloc
+            limit = limits.setdefault(host, HostLimit(host_concurrency))
+            bucket = None
+            if rate is not None:
+                bucket = buckets.setdefault(host, TokenBucket(rate, burst))
+            html = await fetch(session, url, limit, bucket)
+            if results >= max_pages:
+                return False
+            # reserve the slot before awaiting so max_pages stays exact
+            results += 1
             try:
-                allowed, reason = allowed_by_robots(url, rp_cache)
-                if not allowed:
-                    with open(ERROR_FILE, "a", encoding="utf-8") as f:
-                        f.write(f"{url}\t{reason}\n")
-                    continue
-                r = session.get(url, timeout=timeout)
-                r.raise_for_status()
-                html = r.text
-                text = clean_text(html)
-                save_page(url, html, text)
-                with open(DONE_FILE, "a", encoding="utf-8") as f:
-                    f.write(url + "\n")
-                results += 1
-                pbar.update(1)
-
-                if depth < max_depth:
-                    for u in extract_links(url, html, seed_hosts):
-                        if u not in visited:
-                            queue.append((u, depth + 1))
-
-            except Exception as e:
-                with open(ERROR_FILE, "a", encoding="utf-8") as f:
-                    f.write(f"{url}\t{e}\n")
+                # parsing and gzip are CPU-bound, keep them off the event loop
+                base, links = await asyncio.get_running_loop().run_in_executor(
+                    pool, process_page, url, html, seed_hosts, depth < max_depth
+                )
+            except Exception:
+                results -= 1
+                raise
+            store.mark_done(url, os.path.basename(base))
+            pbar.update(1)
+
+            for u in links:
+                enqueue(u, depth + 1)
+
+        except Exception as e:
+            store.log_error(url, e)
+        return True
+
+    async def feed():
+        # moves frontier rows into the in-memory buffer until nothing is left
+        last_id = 0
+        while results < max_pages:
+            rows = store.frontier_after(last_id, FRONTIER_BUFFER)
+            if not rows:
+                await queue.join()
+                rows = store.frontier_after(last_id, FRONTIER_BUFFER)
+                if not rows:
+                    return
+            for row_id, url, depth in rows:
+                last_id = row_id
+                await queue.put((url, depth))
+
+    async def worker(session, robots, pool, pbar):
+        # total concurrency is bounded by the number of workers, per host by HostLimit
+        while True:
+            url, depth = await queue.get()
+            try:
+                # pages left once max_pages is hit stay in the frontier for resume
+                if results < max_pages and await visit(
+                    session, robots, pool, url, depth, pbar
+                ):
+                    store.drop(url)
             finally:
-                time.sleep(delay)
+                queue.task_done()
+
+    try:
+        with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+            async with get_session(timeout) as session:
+                robots = RobotsCache(session)
+                await robots.prefetch(seeds)
+                with tqdm(total=max_pages, desc="Crawling Web BFS") as pbar:
+                    workers = [
+                        asyncio.create_task(worker(session, robots, pool, pbar))
+                        for _ in range(concurrency)
+                    ]
+                    await feed()
+                    await queue.join()
+                    for w in workers:
+                        w.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+                await robots.close()
+    finally:
+        store.close()
+
+
+def run(
+    seeds: list,
+    max_pages: int,
+    max_depth: int,
+    delay: float,
+    timeout: int,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    host_concurrency: int = DEFAULT_HOST_CONCURRENCY,
+    burst: int = DEFAULT_BURST,
+):
+    asyncio.run(
+        crawl(
+            seeds,
+            max_pages,
+            max_depth,
+            delay,
+            timeout,
+            concurrency,
+            host_concurrency,
+            burst,
+        )
+    )
 
 
 def parse_args():
@@ -234,14 +647,46 @@ def parse_args():
     p.add_argument("--seeds", nargs="+", default=list(SEED_HOSTS), help="Seed URLs")
     p.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES)
     p.add_argument("--max-depth", type=int, default=DEFAULT_DEPTH)
-    p.add_argument("--delay", type=float, default=DEFAULT_DELAY)
+    p.add_argument(
+        "--delay",
+        type=float,
+        default=DEFAULT_DELAY,
+        help="Seconds per request to the same host (token refill interval)",
+    )
+    p.add_argument(
+        "--burst",
+        type=int,
+        default=DEFAULT_BURST,
+        help="Requests a host may receive back to back before --delay applies",
+    )
     p.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT)
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Number of pages fetched in parallel",
+    )
+    p.add_argument(
+        "--host-concurrency",
+        type=int,
+        default=DEFAULT_HOST_CONCURRENCY,
+        help="Upper bound for the adaptive per-host parallelism",
+    )
     return p.parse_args()
 
 
 def main():
     args = parse_args()
-    run(args.seeds, args.max_pages, args.max_depth, args.delay, args.timeout)
+    run(
+        args.seeds,
+        args.max_pages,
+        args.max_depth,
+        args.delay,
+        args.timeout,
+        args.concurrency,
+        args.host_concurrency,
+        args.burst,
+    )
 
 
 if __name__ == "__main__":
@@ -3,6 +3,13 @@ import os
 from rdflib import Graph, Namespace, URIRef
 from rdflib.namespace import RDF
 
+try:
+    import oxrdflib  # noqa: F401 -- registers the Rust-backed "Oxigraph" store + "ox-*" formats
+
+    GRAPH_STORE, FORMAT_PREFIX = "Oxigraph", "ox-"
+except ImportError:
+    GRAPH_STORE, FORMAT_PREFIX = "default", ""
+
 SILVER_FILE = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "../silver/normalized/silver.ttl")
 )
@@ -17,21 +24,26 @@ ONTOLOGY_FILE = os.path.abspath(
 KG = Namespace("https://kg-football.vn/ontology#")
 PROV = Namespace("http://www.w3.org/ns/prov#")
 CC = Namespace("http://creativecommons.org/ns#")
+# resolved once: Namespace attribute access builds a fresh URIRef every time
+WAS_DERIVED_FROM = PROV.wasDerivedFrom
+HAS_LICENSE = CC.license
+SOURCE = URIRef("https://vi.wikipedia.org")
+LICENSE = URIRef("https://creativecommons.org/licenses/by-sa/4.0/")
 
 
 def enrich_and_validate():
-    g = Graph()
+    g = Graph(store=GRAPH_STORE)
     if os.path.exists(ONTOLOGY_FILE):
-        g.parse(ONTOLOGY_FILE, format="turtle")
+        g.parse(ONTOLOGY_FILE, format=FORMAT_PREFIX + "turtle")
     if os.path.exists(SILVER_FILE):
-        g.parse(SILVER_FILE, format="turtle")
+        g.parse(SILVER_FILE, format=FORMAT_PREFIX + "turtle")
 
     # add minimal provenance and license to all subjects created in silver
-    for s in set(g.subjects(RDF.type, None)):
-        g.add((s, PROV.wasDerivedFrom, URIRef("https://vi.wikipedia.org")))
-        g.add(
-            (s, CC.license, URIRef("https://creativecommons.org/licenses/by-sa/4.0/"))
-        )
+    # subjects are collected before writing: the memory store can't be
+    # modified while one of its generators is live
+    subjects = list(g.subjects(RDF.type, None, unique=True))
+    g.addN((s, WAS_DERIVED_FROM, SOURCE, g) for s in subjects)
+    g.addN((s, HAS_LICENSE, LICENSE, g) for s in subjects)
 
     # TODO: Thêm SHACL validation thật bằng pyshacl nếu cần
     return g
@@ -40,8 +52,10 @@ def enrich_and_validate():
 def main():
     os.makedirs(GOLD_DIR, exist_ok=True)
     g = enrich_and_validate()
-    out = os.path.join(GOLD_DIR, "gold.ttl")
-    g.serialize(destination=out, format="turtle")
+    # N-Triples skips the Turtle prettifier (prefix compaction, subject grouping),
+    # which dominates serialization time on large graphs
+    out = os.path.join(GOLD_DIR, "gold.nt")
+    g.serialize(destination=out, format=FORMAT_PREFIX + "nt", encoding="utf-8")
     print("Wrote", out)
 
 
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared runner for the DBpedia mapping scripts.
+
+Each *_mapping.py module only declares INPUT_TTL, OUTPUT_TTL, MODE, PREFIXES,
+CLASS_MAPPING and PROP_MAPPING; run() does the parse / add / serialize part.
+
+- MODE = "sub"   -> rdfs:subClassOf / rdfs:subPropertyOf
+- MODE = "equiv" -> owl:equivalentClass / owl:equivalentProperty
+"""
+
+import os
+import pickle
+
+from rdflib import Graph, RDFS, OWL
+
+
+def load_cached(ttl):
+    """Parse `ttl`, reusing a pickled graph next to it while the TTL is unchanged."""
+    cache = ttl + ".pkl"
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(ttl):
+        try:
+            with open(cache, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # stale or unreadable (e.g. written by another rdflib version): reparse
+    g = Graph()
+    g.parse(ttl, format="turtle")
+    tmp = cache + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(g, f, protocol=5)
+    os.replace(tmp, cache)
+    return g
+
+
+def run(input_ttl, output_ttl, class_map, prop_map, mode="sub", prefixes=None):
+    g = load_cached(input_ttl)
+
+    # Bind prefixes for nicer TTL
+    for prefix, ns in (prefixes or {}).items():
+        g.bind(prefix, ns)
+
+    if mode == "equiv":
+        class_pred, prop_pred = OWL.equivalentClass, OWL.equivalentProperty
+    else:
+        class_pred, prop_pred = RDFS.subClassOf, RDFS.subPropertyOf
+
+    # Add class and property mappings in one bulk insert
+    g.addN(
+        [(kg_cls, class_pred, dbo_cls, g) for kg_cls, dbo_cls in class_map.items()]
+        + [(kg_prop, prop_pred, dbo_prop, g) for kg_prop, dbo_prop in prop_map.items()]
+    )
+
+    g.serialize(output_ttl, format="turtle")
+    print(f"Done: wrote {output_ttl} (mode={mode})")
+    return g
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Build every file in ontology/mapping/ from one command, one worker process per mapping.
+
+Run from the repository root, like the individual *_mapping.py scripts:
+
+    python3 scripts/mapping/build_mappings.py
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import competition_mapping
+import core_mapping
+import geo_mapping
+import org_mapping
+import players_mapping
+import shapes_mapping
+
+MAPPINGS = [
+    competition_mapping,
+    core_mapping,
+    geo_mapping,
+    org_mapping,
+    players_mapping,
+]
+
+
+def main():
+    failed = []
+    # shapes are constraints, not vocabulary: they only get a stub file
+    steps = [(m.__name__, m.main) for m in MAPPINGS] + [("shapes_mapping", shapes_mapping.main)]
+    # every step reads its own input and writes its own output file, so they run in parallel
+    with ProcessPoolExecutor(max_workers=min(len(steps), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(step): name for name, step in steps}
+        for fut in as_completed(futures):
+            # one broken ontology file shouldn't stop the other mappings
+            try:
+                fut.result()
+            except Exception as e:
+                print(f"FAILED {futures[fut]}: {e}", file=sys.stderr)
+                failed.append(futures[fut])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
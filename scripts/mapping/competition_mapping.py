@@ -10,7 +10,9 @@ Generate DBpedia mappings for ontology/competition.ttl
 Output: ontology/mapping/map_competition_dbpedia.ttl
 """
 
-from rdflib import Graph, Namespace, RDFS, OWL
+from rdflib import Namespace, RDFS, OWL
+
+from _runner import run
 
 # ----- CONFIG -----
 INPUT_TTL  = "ontology/competition.ttl"
@@ -23,6 +25,15 @@ DBO    = Namespace("http://dbpedia.org/ontology/")
 SCHEMA = Namespace("http://schema.org/")
 TIME   = Namespace("http://www.w3.org/2006/time#")
 
+PREFIXES = {
+    "kg": KG,
+    "dbo": DBO,
+    "schema": SCHEMA,
+    "time": TIME,
+    "rdfs": RDFS,
+    "owl": OWL,
+}
+
 # ----- MAPPINGS -----
 # Classes in competition.ttl
 CLASS_MAPPING = {
@@ -58,34 +69,7 @@ PROP_MAPPING = {
 
 # ----- MAIN -----
 def main():
-    g = Graph()
-    g.parse(INPUT_TTL, format="turtle")
-
-    # Bind prefixes for nicer TTL
-    g.bind("kg", KG)
-    g.bind("dbo", DBO)
-    g.bind("schema", SCHEMA)
-    g.bind("time", TIME)
-    g.bind("rdfs", RDFS)
-    g.bind("owl", OWL)
-
-    # Add class mappings
-    for kg_cls, dbo_cls in CLASS_MAPPING.items():
-        if MODE == "equiv":
-            g.add((kg_cls, OWL.equivalentClass, dbo_cls))
-        else:
-            g.add((kg_cls, RDFS.subClassOf, dbo_cls))
-
-    # Add property mappings
-    for kg_prop, dbo_prop in PROP_MAPPING.items():
-        if MODE == "equiv":
-            g.add((kg_prop, OWL.equivalentProperty, dbo_prop))
-        else:
-            g.add((kg_prop, RDFS.subPropertyOf, dbo_prop))
-
-    # Serialize
-    g.serialize(OUTPUT_TTL, format="turtle")
-    print(f"Done: wrote {OUTPUT_TTL} (mode={MODE})")
+    run(INPUT_TTL, OUTPUT_TTL, CLASS_MAPPING, PROP_MAPPING, MODE, PREFIXES)
 
 if __name__ == "__main__":
     main()
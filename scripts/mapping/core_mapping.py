@@ -10,7 +10,9 @@ Generate DBpedia mappings for ontology/core.ttl
 Output: ontology/mapping/map_core_dbpedia.ttl
 """
 
-from rdflib import Graph, Namespace, RDFS, OWL
+from rdflib import Namespace, RDFS, OWL
+
+from _runner import run
 
 # ----- CONFIG -----
 INPUT_TTL  = "ontology/core.ttl"
@@ -22,6 +24,14 @@ KG   = Namespace("https://kg-football.vn/ontology#")
 DBO  = Namespace("http://dbpedia.org/ontology/")
 SCM  = Namespace("http://schema.org/")
 
+PREFIXES = {
+    "kg": KG,
+    "dbo": DBO,
+    "schema": SCM,
+    "rdfs": RDFS,
+    "owl": OWL,
+}
+
 # ----- CLASS MAPPING -----
 CLASS_MAPPING = {
     # Core domain classes
@@ -70,33 +80,9 @@ PROP_MAPPING = {
     # (schema:name thường dùng sẵn, không map lại)
 }
 
+# ----- MAIN -----
 def main():
-    g = Graph()
-    g.parse(INPUT_TTL, format="turtle")
-
-    # Bind prefixes for nicer TTL
-    g.bind("kg", KG)
-    g.bind("dbo", DBO)
-    g.bind("schema", SCM)
-    g.bind("rdfs", RDFS)
-    g.bind("owl", OWL)
-
-    # Add class mappings
-    for kg_cls, dbo_cls in CLASS_MAPPING.items():
-        if MODE == "equiv":
-            g.add((kg_cls, OWL.equivalentClass, dbo_cls))
-        else:
-            g.add((kg_cls, RDFS.subClassOf, dbo_cls))
-
-    # Add property mappings
-    for kg_prop, dbo_prop in PROP_MAPPING.items():
-        if MODE == "equiv":
-            g.add((kg_prop, OWL.equivalentProperty, dbo_prop))
-        else:
-            g.add((kg_prop, RDFS.subPropertyOf, dbo_prop))
-
-    g.serialize(OUTPUT_TTL, format="turtle")
-    print(f"Done: wrote {OUTPUT_TTL} (mode={MODE})")
+    run(INPUT_TTL, OUTPUT_TTL, CLASS_MAPPING, PROP_MAPPING, MODE, PREFIXES)
 
 if __name__ == "__main__":
     main()
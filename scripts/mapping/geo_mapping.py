@@ -1,37 +1,36 @@
-from rdflib import Graph, Namespace, RDF, RDFS, OWL, URIRef
+from rdflib import Namespace
 
-# Load file TTL
-g = Graph()
-g.parse("ontology/geo.ttl", format="ttl") 
+from _runner import run
+
+INPUT_TTL = "ontology/geo.ttl"
+OUTPUT_TTL = "ontology/mapping/mapped_geo.ttl"
+MODE = "equiv"
 
 # Namespace
 KG = Namespace("https://kg-football.vn/ontology#")
 DBO = Namespace("http://dbpedia.org/ontology/")
 GEO = Namespace("http://www.opengis.net/ont/geosparql#")
 
+PREFIXES = {}
+
 # Mapping classes
-class_mapping = {
+CLASS_MAPPING = {
     KG.Place: DBO.Place,
     KG.City: DBO.City,
     KG.Country: DBO.Country
 }
 
 # Mapping properties
-property_mapping = {
+PROP_MAPPING = {
     KG.locatedIn: DBO.isPartOf,  
     KG.geometry: GEO.hasGeometry,
     KG.wkt: GEO.asWKT
 }
 
-# Thêm owl:equivalentClass cho classes
-for kg_class, dbo_class in class_mapping.items():
-    g.add((kg_class, OWL.equivalentClass, dbo_class))
 
-# Thêm owl:equivalentProperty cho properties
-for kg_prop, dbo_prop in property_mapping.items():
-    g.add((kg_prop, OWL.equivalentProperty, dbo_prop))
+def main():
+    run(INPUT_TTL, OUTPUT_TTL, CLASS_MAPPING, PROP_MAPPING, MODE, PREFIXES)
 
-# Xuất file TTL mới
-g.serialize(destination="ontology/mapping/mapped_geo.ttl", format="turtle")
-print("Done")
 
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
-from rdflib import Graph, Namespace, RDF, RDFS, OWL, URIRef
+from rdflib import Namespace
 
-# Load file TTL
-g = Graph()
-g.parse("ontology/org.ttl", format="ttl")  
+from _runner import run
+
+INPUT_TTL = "ontology/org.ttl"
+OUTPUT_TTL = "ontology/mapping/mapped_org.ttl"
+MODE = "equiv"
 
 # Định nghĩa namespace
 KG = Namespace("https://kg-football.vn/ontology#")
 DBO = Namespace("http://dbpedia.org/ontology/")
 
+PREFIXES = {}
+
 # Mapping classes: kg:Class -> dbo:Class
-class_mapping = {
+CLASS_MAPPING = {
     KG.Team: DBO.SportsTeam,
     KG.Club: DBO.FootballClub,
     KG.NationalTeam: DBO.NationalFootballTeam,
@@ -20,7 +24,7 @@ class_mapping = {
 }
 
 # Mapping properties: kg:property -> dbo:property
-property_mapping = {
+PROP_MAPPING = {
     KG.homeStadium: DBO.ground,
     KG.isHomeOf: DBO.ground,
     KG.manages: DBO.manager,
@@ -32,15 +36,10 @@ property_mapping = {
     KG.foundedDate: DBO.foundingDate
 }
 
-# Add equivalentClass triples
-for kg_class, dbo_class in class_mapping.items():
-    g.add((kg_class, OWL.equivalentClass, dbo_class))
 
-# Add equivalentProperty triples
-for kg_prop, dbo_prop in property_mapping.items():
-    g.add((kg_prop, OWL.equivalentProperty, dbo_prop))
+def main():
+    run(INPUT_TTL, OUTPUT_TTL, CLASS_MAPPING, PROP_MAPPING, MODE, PREFIXES)
 
-# Xuất ra file TTL mới
-g.serialize(destination="ontology/mapping/mapped_org.ttl", format="turtle")
-print("Done")
 
+if __name__ == "__main__":
+    main()
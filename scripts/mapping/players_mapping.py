@@ -1,34 +1,42 @@
-from rdflib import Graph, Namespace, OWL
+from rdflib import Namespace
+
+from _runner import run
+
+INPUT_TTL = "ontology/people.ttl"
+OUTPUT_TTL = "ontology/mapping/mapped_players.ttl"
+MODE = "equiv"
 
 # --- Namespaces ---
 KG = Namespace("https://kg-football.vn/ontology#")
 DBO = Namespace("http://dbpedia.org/ontology/")
 
-# --- Load ontology
-g = Graph()
-g.parse("ontology/people.ttl", format="turtle")  
-
-# --- Bind namespaces ---
-g.bind("kg", KG)
-g.bind("dbo", DBO)
+PREFIXES = {
+    "kg": KG,
+    "dbo": DBO,
+}
 
-# --- Thêm mapping KG -> DBpedia ---
-g.add((KG.Player, OWL.equivalentClass, DBO.SoccerPlayer))
-g.add((KG.Goalkeeper, OWL.equivalentClass, DBO.Goalkeeper))
-g.add((KG.Defender, OWL.equivalentClass, DBO.Defender))
-g.add((KG.Midfielder, OWL.equivalentClass, DBO.Midfielder))
-g.add((KG.Forward, OWL.equivalentClass, DBO.Forward))
+# --- Mapping KG -> DBpedia ---
+CLASS_MAPPING = {
+    KG.Player: DBO.SoccerPlayer,
+    KG.Goalkeeper: DBO.Goalkeeper,
+    KG.Defender: DBO.Defender,
+    KG.Midfielder: DBO.Midfielder,
+    KG.Forward: DBO.Forward,
+}
 
-g.add((KG.birthPlace, OWL.equivalentProperty, DBO.birthPlace))
-g.add((KG.nationality, OWL.equivalentProperty, DBO.nationality))
-g.add((KG.height, OWL.equivalentProperty, DBO.height))
-g.add((KG.weight, OWL.equivalentProperty, DBO.weight))
-g.add((KG.primaryPosition, OWL.equivalentProperty, DBO.position))
-g.add((KG.secondaryPosition, OWL.equivalentProperty, DBO.position))
+PROP_MAPPING = {
+    KG.birthPlace: DBO.birthPlace,
+    KG.nationality: DBO.nationality,
+    KG.height: DBO.height,
+    KG.weight: DBO.weight,
+    KG.primaryPosition: DBO.position,
+    KG.secondaryPosition: DBO.position,
+}
 
-# --- Serialize ra file mới ---
-g.serialize("ontology/mapping/mapped_players.ttl", format="turtle")
-print("Done")
 
+def main():
+    run(INPUT_TTL, OUTPUT_TTL, CLASS_MAPPING, PROP_MAPPING, MODE, PREFIXES)
 
 
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ that SHACL shapes are constraints, not vocabulary to be mapped to DBpedia.
 from rdflib import Graph, Namespace, RDF, RDFS, OWL, URIRef, Literal
 from rdflib.namespace import DCTERMS
 
+from _runner import load_cached
+
 # ---- INPUT / OUTPUT ----
 SHAPES_TTL  = "ontology/shapes.ttl"
 OUTPUT_TTL  = "ontology/mapping/map_shapes_stub.ttl"
@@ -30,8 +32,7 @@ TIME = Namespace("http://www.w3.org/2006/time#")
 
 def main():
     # load shapes
-    g_in = Graph()
-    g_in.parse(SHAPES_TTL, format="turtle")
+    g_in = load_cached(SHAPES_TTL)
 
     # prepare output graph
     g = Graph()
@@ -54,9 +55,12 @@ def main():
     g.add((MAP, OWL.imports, ONTO))
 
     # OPTIONAL: document NodeShapes -> their target classes via rdfs:seeAlso
-    for node_shape in g_in.subjects(RDF.type, SH.NodeShape):
-        for cls in g_in.objects(node_shape, SH.targetClass):
-            g.add((node_shape, RDFS.seeAlso, cls))
+    see_also, target_class = RDFS.seeAlso, SH.targetClass
+    g.addN(
+        (node_shape, see_also, cls, g)
+        for node_shape in g_in.subjects(RDF.type, SH.NodeShape)
+        for cls in g_in.objects(node_shape, target_class)
+    )
 
     # write
     g.serialize(OUTPUT_TTL, format="turtle")
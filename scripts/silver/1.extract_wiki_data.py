@@ -7,11 +7,14 @@ Trích xuất: title, content (revision cuối cùng), touched, canonicalurl
 
 import json
 import os
-import glob
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from tqdm import tqdm
 
+from _jsonio import load_json, dump_jsonl
+
 class WikiDataExtractor:
     def __init__(self, input_dir: str = "bronze/wiki_raw"):
         """
@@ -22,7 +25,8 @@ class WikiDataExtractor:
         """
         self.input_dir = Path(input_dir)
         
-    def extract_from_file(self, file_path: str) -> Optional[Dict]:
+    @staticmethod
+    def extract_from_file(file_path: str) -> Optional[Dict]:
         """
         Trích xuất dữ liệu từ một file JSON
         
@@ -33,8 +37,7 @@ class WikiDataExtractor:
             Dict chứa title, content, touched, canonicalurl hoặc None nếu lỗi
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json(file_path)
             
             # Kiểm tra cấu trúc dữ liệu
             if 'query' not in data or 'pages' not in data['query']:
@@ -53,7 +56,7 @@ class WikiDataExtractor:
                 if not pages:
                     print(f"File {file_path} không có pages")
                     return None
-                page = list(pages.values())[0]  # Lấy page đầu tiên
+                page = next(iter(pages.values()))  # Lấy page đầu tiên
             else:
                 print(f"File {file_path} có cấu trúc pages không hợp lệ")
                 return None
@@ -87,12 +90,13 @@ class WikiDataExtractor:
             print(f"Lỗi khi đọc file {file_path}: {e}")
             return None
     
-    def extract_from_directory(self, pattern: str = "*.json") -> List[Dict]:
+    def extract_from_directory(self, pattern: str = "*.json", workers: Optional[int] = None) -> List[Dict]:
         """
-        Trích xuất dữ liệu từ tất cả file JSON trong thư mục
+        Trích xuất dữ liệu từ tất cả file JSON trong thư mục (song song trên nhiều process)
         
         Args:
             pattern: Pattern để tìm file (mặc định: *.json)
+            workers: Số process (mặc định: số CPU)
             
         Returns:
             List các Dict chứa dữ liệu trích xuất
@@ -101,21 +105,21 @@ class WikiDataExtractor:
             print(f"Thư mục {self.input_dir} không tồn tại")
             return []
         
-        # Tìm tất cả file JSON
-        json_files = list(self.input_dir.glob(pattern))
+        # Tìm tất cả file JSON: một lần os.scandir, loại file dựa trên dirent (không stat từng file)
+        json_files = [entry.path for entry in os.scandir(self.input_dir)
+                      if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()]
         print(f"Tìm thấy {len(json_files)} file JSON trong {self.input_dir}")
         
-        results = []
-        for file_path in tqdm(json_files, desc="Đang xử lý"):
-            data = self.extract_from_file(str(file_path))
-            if data:
-                results.append(data)
+        # Mỗi file độc lập -> chia cho process pool, chunksize để giảm chi phí IPC
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            extracted = executor.map(self.extract_from_file, json_files, chunksize=32)
+            results = [data for data in tqdm(extracted, total=len(json_files), desc="Đang xử lý") if data]
         
         return results
     
-    def save_to_json(self, data: List[Dict], output_file: str = "silver/extracted_wiki/extracted_wiki_data.json"):
+    def save_to_json(self, data: List[Dict], output_file: str = "silver/extracted_wiki/extracted_wiki_data.jsonl"):
         """
-        Lưu dữ liệu đã trích xuất vào file JSON
+        Lưu dữ liệu đã trích xuất vào file NDJSON (mỗi dòng một record)
         
         Args:
             data: List dữ liệu đã trích xuất
@@ -126,9 +130,8 @@ class WikiDataExtractor:
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"Đã lưu {len(data)} records vào {output_file}")
+            count = dump_jsonl(data, output_file)
+            print(f"Đã lưu {count} records vào {output_file}")
         except Exception as e:
             print(f"Lỗi khi lưu file {output_file}: {e}")
     
@@ -182,8 +185,8 @@ def main():
         # In tóm tắt
         extractor.print_summary(data)
         
-        # Lưu vào file JSON
-        extractor.save_to_json(data, "silver/extracted_wiki/extracted_wiki_data.json")
+        # Lưu vào file NDJSON
+        extractor.save_to_json(data, "silver/extracted_wiki/extracted_wiki_data.jsonl")
         
         print(f"\nHoàn thành! Đã trích xuất {len(data)} file.")
     else:
@@ -1,71 +1,158 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Script xử lý content từ file extracted_wiki_data.json
+Script xử lý content từ file extracted_wiki_data.jsonl
 - Lọc câu có link/ảnh hoặc từ khóa trong matching_rules
 - NER để phân ra S, P, O
 - Match với class/property trong ontology
 """
 
-import json
 import re
-from typing import Dict, List, Optional, Tuple, Set
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 from tqdm import tqdm
 
+from _jsonio import load_json, dump_jsonl, iter_records
+from _keywords import KeywordMatcher
+
+# Regex biên dịch sẵn một lần cho cả module
+# link/ảnh: [[File:...]] / [[Tập tin:...]], link wiki [[...]], external link [url text]
+# mọi dạng trên đều khớp \[[^\]]+\] nên chỉ cần một nhánh, không phải thử lại từng nhánh
+_LINK_ANY_RE = re.compile(r'\[[^\]]+\]')
+_WIKI_LINK_RE = re.compile(r'\[\[([^\]]+)\]\]')
+_EXTERNAL_LINK_RE = re.compile(r'\[[^\s]+\s+([^\]]+)\]')
+_TEMPLATE_RE = re.compile(r'\{\{[^}]*\}\}')
+_REF_RE = re.compile(r'<ref[^>]*>.*?</ref>', re.DOTALL)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_TABLE_RE = re.compile(r'\{\|.*?\|\}', re.DOTALL)
+_TABLE_TITLE_RE = re.compile(r'\|\+\s*([^\n]+)')
+_INFOBOX_RE = re.compile(r'\{\{Infobox[^}]*\}\}', re.DOTALL)
+_BRACES_RE = re.compile(r'[{}]')
+# các token làm thay đổi độ sâu lồng nhau trong infobox (link, template, <ref>, comment), và dấu | tách trường
+_INFOBOX_TOKEN_RE = re.compile(r'<!--|-->|<ref\b[^>]*>|</ref\s*>|\[\[|\]\]|\{\{|\}\}|\|', re.IGNORECASE)
+
+
+@lru_cache(maxsize=65536)
+def _clean_infobox_value(value: str) -> str:
+    """Làm sạch giá trị một trường infobox (cache lại vì các template lặp lại rất nhiều giữa các bài)"""
+    value = _BRACES_RE.sub('', value)
+    
+    # Loại bỏ các template phức tạp trong value
+    value = _TEMPLATE_RE.sub('', value)
+    value = _REF_RE.sub('', value)
+    value = _WIKI_LINK_RE.sub(r'\1', value)  # Chuyển [[text]] thành text
+    return value.strip()
+
+# Ô bảng chỉ chứa ký hiệu trống
+_EMPTY_CELLS = frozenset({'—', '-', 'N/A', ''})
+
+
+def _meaningful_cells(cells: List[str]) -> List[str]:
+    """Các ô bảng (đã strip) có ý nghĩa: đủ dài, không phải số thuần túy, không phải ô trống/ký hiệu"""
+    # isdigit() đã bao gồm mọi chuỗi khớp ^\d+$ nên không cần thêm regex
+    return [cell for cell in cells
+            if len(cell) > 3 and not cell.isdigit() and cell not in _EMPTY_CELLS]
+
+
+def _iter_infobox_fields(infobox: str) -> Iterator[Tuple[str, str]]:
+    """
+    Tách infobox thành các cặp (field, value) trong một lần quét.
+    Chỉ tách ở dấu | nằm ngay trong {{Infobox ...}} (không tách | bên trong [[...]], template lồng,
+    <ref>...</ref> hay <!-- ... -->).
+    Value chỉ lấy dòng đầu tiên, giống cách đọc từng dòng |field = value.
+    """
+    templates = 0  # độ sâu {{ }}, 1 = ngay trong infobox
+    links = 0      # độ sâu [[ ]]
+    in_ref = False
+    in_comment = False
+    seg_start = None
+    
+    def emit(segment: str):
+        field, sep, value = segment.partition('=')
+        if sep:
+            return field.strip(), value.split('\n', 1)[0].strip()
+        return None
+    
+    for m in _INFOBOX_TOKEN_RE.finditer(infobox):
+        token = m.group()
+        if in_comment:
+            # trong comment chỉ quan tâm tới dấu đóng
+            in_comment = token != '-->'
+        elif token == '|':
+            if templates == 1 and links == 0 and not in_ref:
+                if seg_start is not None:
+                    pair = emit(infobox[seg_start:m.start()])
+                    if pair:
+                        yield pair
+                seg_start = m.end()
+        elif token == '[[':
+            links += 1
+        elif token == ']]':
+            # ]] lạc không được làm mất các trường phía sau
+            links = max(0, links - 1)
+        elif token == '{{':
+            templates += 1
+        elif token == '}}':
+            templates = max(0, templates - 1)
+        elif token == '<!--':
+            in_comment = True
+        elif token.startswith('</'):
+            in_ref = False
+        elif token.startswith('<'):
+            in_ref = not token.endswith('/>')  # <ref name=... /> không mở thẻ
+    if seg_start is not None:
+        # trường cuối cùng kết thúc ở }} đóng infobox
+        end = infobox.rfind('}}')
+        pair = emit(infobox[seg_start:end if end >= seg_start else len(infobox)])
+        if pair:
+            yield pair
+
 class WikiContentProcessor:
-    def __init__(self, extracted_file: str = "silver/extracted_wiki/extracted_wiki_data.json", 
+    def __init__(self, extracted_file: str = "silver/extracted_wiki/extracted_wiki_data.jsonl", 
                  rules_file: str = "scripts/silver/matching_rules.json"):
         """
         Khởi tạo processor
         
         Args:
-            extracted_file: File chứa dữ liệu đã trích xuất
+            extracted_file: File chứa dữ liệu đã trích xuất (NDJSON, hoặc JSON array kiểu cũ)
             rules_file: File chứa matching rules
         """
         self.extracted_file = Path(extracted_file)
         self.rules_file = Path(rules_file)
         self.matching_rules = self._load_matching_rules()
         self.all_keywords = self._get_all_keywords()
+        self._keyword_matcher = KeywordMatcher(sorted(self.all_keywords))
         
     def _load_matching_rules(self) -> Dict:
         """Load matching rules từ file JSON"""
         try:
-            with open(self.rules_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json(self.rules_file)
         except Exception as e:
             print(f"Lỗi khi load matching rules: {e}")
             return {"classes": {}, "properties": {}}
     
-    def _get_all_keywords(self) -> Set[str]:
-        """Lấy tất cả keywords để tìm kiếm nhanh"""
-        keywords = set()
-        
-        for class_info in self.matching_rules.get("classes", {}).values():
-            keywords.update(class_info.get("keywords", []))
-        
-        for prop_info in self.matching_rules.get("properties", {}).values():
-            keywords.update(prop_info.get("keywords", []))
-        
-        return keywords
+    def _get_all_keywords(self) -> FrozenSet[str]:
+        """Lấy tất cả keywords (đã lower() sẵn một lần) để tìm kiếm nhanh"""
+        rules = (
+            *self.matching_rules.get("classes", {}).values(),
+            *self.matching_rules.get("properties", {}).values(),
+        )
+        return frozenset(kw.lower() for info in rules for kw in info.get("keywords", []))
     
     def _has_links_or_images(self, text: str) -> bool:
         """Kiểm tra xem text có chứa link hoặc ảnh không"""
-        # Pattern cho link Wikipedia [[...]]
-        wiki_link_pattern = r'\[\[([^\]]+)\]\]'
-        # Pattern cho ảnh [[File:...]] hoặc [[Tập tin:...]]
-        image_pattern = r'\[\[(?:File|Tập tin):[^\]]+\]\]'
-        # Pattern cho external link [url text]
-        external_link_pattern = r'\[[^\]]+\]'
-        
-        return bool(re.search(wiki_link_pattern, text) or 
-                   re.search(image_pattern, text) or 
-                   re.search(external_link_pattern, text))
+        return _LINK_ANY_RE.search(text) is not None
     
     def _has_matching_keywords(self, text: str) -> bool:
         """Kiểm tra xem text có chứa từ khóa nào trong matching rules không"""
-        text_lower = text.lower()
-        return any(keyword.lower() in text_lower for keyword in self.all_keywords)
+        return self._keyword_matcher.any_in(text.lower())
+    
+    def _should_keep(self, sentence: str) -> bool:
+        """Câu có link/ảnh hoặc từ khóa; dừng ngay khi điều kiện đầu tiên đúng"""
+        return self._has_links_or_images(sentence) or self._has_matching_keywords(sentence)
     
     def _parse_wiki_content(self, content: str) -> List[str]:
         """Xử lý wiki text và trích xuất các câu có ý nghĩa"""
@@ -79,19 +166,14 @@ class WikiContentProcessor:
         content = self._process_links(content)
         
         # Loại bỏ các template và markup phức tạp
-        content = re.sub(r'\{\{[^}]*\}\}', '', content)  # Loại bỏ templates
-        content = re.sub(r'<ref[^>]*>.*?</ref>', '', content, flags=re.DOTALL)  # Loại bỏ references
-        content = re.sub(r'<[^>]+>', '', content)  # Loại bỏ HTML tags
+        content = _TEMPLATE_RE.sub('', content)  # Loại bỏ templates
+        content = _REF_RE.sub('', content)  # Loại bỏ references
+        content = _HTML_TAG_RE.sub('', content)  # Loại bỏ HTML tags
         
-        # Chia thành câu dựa trên dấu chấm, chấm hỏi, chấm than
-        sentences = re.split(r'[.!?]+', content)
-        
-        # Lọc và làm sạch câu
-        clean_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 10:  # Chỉ lấy câu có độ dài > 10 ký tự
-                clean_sentences.append(sentence)
+        # Chia thành câu dựa trên dấu chấm, chấm hỏi, chấm than, làm sạch và
+        # chỉ lấy câu có độ dài > 10 ký tự
+        clean_sentences = [sentence for sentence in map(str.strip, _SENTENCE_SPLIT_RE.split(content))
+                           if len(sentence) > 10]
         
         # Kết hợp tất cả các câu
         all_sentences = table_sentences + infobox_sentences + clean_sentences
@@ -102,12 +184,11 @@ class WikiContentProcessor:
         sentences = []
         
         # Tìm các bảng {| ... |}
-        table_pattern = r'\{\|.*?\|\}'
-        tables = re.findall(table_pattern, content, re.DOTALL)
+        tables = _TABLE_RE.findall(content)
         
         for table in tables:
             # Tìm tiêu đề bảng (sau |+)
-            title_match = re.search(r'\|\+\s*([^\n]+)', table)
+            title_match = _TABLE_TITLE_RE.search(table)
             table_title = ""
             if title_match:
                 table_title = title_match.group(1).strip()
@@ -138,14 +219,7 @@ class WikiContentProcessor:
                     cells = [cell.strip() for cell in data.split('|')]
                     
                     # Lọc các ô có ý nghĩa (không phải số thuần túy, không rỗng)
-                    meaningful_cells = []
-                    for cell in cells:
-                        cell = cell.strip()
-                        if (len(cell) > 3 and 
-                            not cell.isdigit() and 
-                            not re.match(r'^\d+$', cell) and
-                            cell not in ['—', '-', 'N/A', '']):
-                            meaningful_cells.append(cell)
+                    meaningful_cells = _meaningful_cells(cells)
                     
                     # Nếu có ít nhất 2 ô có ý nghĩa, tạo câu mô tả
                     if len(meaningful_cells) >= 2:
@@ -169,37 +243,20 @@ class WikiContentProcessor:
         sentences = []
         
         # Tìm infobox {{Infobox ...}}
-        infobox_pattern = r'\{\{Infobox[^}]*\}\}'
-        infoboxes = re.findall(infobox_pattern, content, re.DOTALL)
+        infoboxes = _INFOBOX_RE.findall(content)
         
         for infobox in infoboxes:
-            # Trích xuất các trường trong infobox
-            lines = infobox.split('\n')
-            for line in lines:
-                line = line.strip()
+            # Trích xuất các trường |field = value trong infobox
+            for field, value in _iter_infobox_fields(infobox):
+                # Làm sạch field và value
+                field = _BRACES_RE.sub('', field)
+                value = _clean_infobox_value(value)
                 
-                # Tìm dòng có format |field = value
-                if '|' in line and '=' in line:
-                    parts = line.split('=', 1)
-                    if len(parts) == 2:
-                        field = parts[0].replace('|', '').strip()
-                        value = parts[1].strip()
-                        
-                        # Làm sạch field và value
-                        field = re.sub(r'[{}]', '', field)
-                        value = re.sub(r'[{}]', '', value)
-                        
-                        # Loại bỏ các template phức tạp trong value
-                        value = re.sub(r'\{\{[^}]*\}\}', '', value)
-                        value = re.sub(r'<ref[^>]*>.*?</ref>', '', value, flags=re.DOTALL)
-                        value = re.sub(r'\[\[([^\]]+)\]\]', r'\1', value)  # Chuyển [[text]] thành text
-                        value = value.strip()
-                        
-                        if len(field) > 2 and len(value) > 3:
-                            # Tạo câu có ý nghĩa
-                            sentence = f"{field} là {value}"
-                            if len(sentence) > 10:
-                                sentences.append(sentence)
+                if len(field) > 2 and len(value) > 3:
+                    # Tạo câu có ý nghĩa
+                    sentence = f"{field} là {value}"
+                    if len(sentence) > 10:
+                        sentences.append(sentence)
         
         return sentences
     
@@ -215,22 +272,18 @@ class WikiContentProcessor:
                 # [[text]] -> text
                 return link_content
         
-        content = re.sub(r'\[\[([^\]]+)\]\]', replace_link, content)
+        content = _WIKI_LINK_RE.sub(replace_link, content)
         
         # Xử lý external links [url text] -> text
-        content = re.sub(r'\[[^\s]+\s+([^\]]+)\]', r'\1', content)
+        content = _EXTERNAL_LINK_RE.sub(r'\1', content)
         
         return content
     
     
     def process_sentence(self, sentence: str) -> Optional[str]:
         """Xử lý một câu và trả về câu đã lọc"""
-        # Kiểm tra xem câu có đáng giữ lại không
-        has_links = self._has_links_or_images(sentence)
-        has_keywords = self._has_matching_keywords(sentence)
-        
         # Chỉ giữ lại câu có từ khóa hoặc có hình ảnh/link
-        if has_links or has_keywords:
+        if self._should_keep(sentence):
             return sentence.strip()
         
         return None
@@ -247,62 +300,82 @@ class WikiContentProcessor:
         
         return processed_sentences
     
-    def process_file(self, limit: Optional[int] = None) -> List[Dict]:
-        """Xử lý toàn bộ file extracted"""
-        try:
-            with open(self.extracted_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except Exception as e:
-            print(f"Lỗi khi đọc file {self.extracted_file}: {e}")
-            return []
+    def _read_records(self) -> Iterator[Dict]:
+        """Đọc lần lượt từng record; chỉ bắt lỗi đọc/parse file, không bắt lỗi khi xử lý record"""
+        records = iter_records(self.extracted_file)
+        while True:
+            try:
+                item = next(records)
+            except StopIteration:
+                return
+            except (OSError, ValueError) as e:
+                print(f"Lỗi khi đọc file {self.extracted_file}: {e}")
+                return
+            yield item
+    
+    def process_file(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """Xử lý toàn bộ file extracted, trả về lần lượt từng item (generator)"""
+        # Đọc lần lượt từng record thay vì load cả file
+        data = self._read_records()
         
         # Giới hạn số lượng items nếu cần
         if limit:
-            data = data[:limit]
+            data = islice(data, limit)
         
-        results = []
         for item in tqdm(data, desc="Đang xử lý"):
             if not item.get('content'):
                 continue
             
             processed_content = self.process_content(item['content'])
             if processed_content:
-                results.append({
+                yield {
                     "title": item['title'],
                     "pageid": item.get('pageid', ''),
                     "canonicalurl": item.get('canonicalurl', ''),
                     "filtered_sentences": processed_content
-                })
-        
-        return results
+                }
     
-    def save_results(self, results: List[Dict], output_file: str = "silver/processed_wiki/processed_content.json"):
-        """Lưu kết quả xử lý"""
+    def save_results(self, results: Iterable[Dict], output_file: str = "silver/processed_wiki/processed_content.jsonl") -> Dict:
+        """
+        Lưu kết quả xử lý (NDJSON, mỗi dòng một item) ngay khi từng item được tạo ra
+        
+        Returns:
+            Thống kê để in bằng print_summary: số items, số câu, vài item ví dụ
+        """
+        stats = {"items": 0, "sentences": 0, "examples": []}
+        
+        def counted():
+            # Gộp thống kê vào chính vòng ghi file, không cần giữ cả list trong RAM
+            for item in results:
+                stats["items"] += 1
+                stats["sentences"] += len(item['filtered_sentences'])
+                if len(stats["examples"]) < 2:
+                    stats["examples"].append(item)
+                yield item
+        
         try:
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
-            print(f"Đã lưu {len(results)} items vào {output_file}")
+            count = dump_jsonl(counted(), output_file)
+            print(f"Đã lưu {count} items vào {output_file}")
         except Exception as e:
             print(f"Lỗi khi lưu file {output_file}: {e}")
+        return stats
     
-    def print_summary(self, results: List[Dict]):
-        """In tóm tắt kết quả"""
-        if not results:
+    def print_summary(self, stats: Dict):
+        """In tóm tắt kết quả (stats trả về từ save_results)"""
+        if not stats["items"]:
             print("Không có dữ liệu để hiển thị")
             return
         
-        total_sentences = sum(len(item['filtered_sentences']) for item in results)
-        
         print(f"\n=== TÓM TẮT XỬ LÝ ===")
-        print(f"Tổng số items: {len(results)}")
-        print(f"Tổng số câu đã lọc: {total_sentences}")
+        print(f"Tổng số items: {stats['items']}")
+        print(f"Tổng số câu đã lọc: {stats['sentences']}")
         
         # Hiển thị ví dụ
         print(f"\n=== VÍ DỤ XỬ LÝ ===")
-        for i, item in enumerate(results[:2]):  # Hiển thị 2 items đầu
+        for i, item in enumerate(stats["examples"]):  # Hiển thị 2 items đầu
             print(f"\n{i+1}. Title: {item['title']}")
             print(f"   Số câu đã lọc: {len(item['filtered_sentences'])}")
             
@@ -318,16 +391,16 @@ def main():
     # Test với 5 items đầu
     print("\n=== TEST VỚI 5 ITEMS ĐẦU ===")
     test_results = processor.process_file(limit=10)
-    processor.print_summary(test_results)
-    processor.save_results(test_results, "silver/processed_wiki/test_processed_content.json")
+    test_stats = processor.save_results(test_results, "silver/processed_wiki/test_processed_content.jsonl")
+    processor.print_summary(test_stats)
     
     # # Xử lý toàn bộ file
     # print("\n=== XỬ LÝ TOÀN BỘ FILE ===")
     # all_results = processor.process_file()
-    # processor.print_summary(all_results)
-    # processor.save_results(all_results, "silver/processed_wiki/processed_content.json")
+    # all_stats = processor.save_results(all_results, "silver/processed_wiki/processed_content.jsonl")
+    # processor.print_summary(all_stats)
     
-    # print(f"\nHoàn thành! Đã xử lý {len(all_results)} items.")
+    # print(f"\nHoàn thành! Đã xử lý {all_stats['items']} items.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Đọc/ghi JSON dùng chung cho các script silver.
+Dùng orjson (nhanh hơn nhiều) nếu đã cài, nếu không thì fallback về json chuẩn.
+"""
+
+import json
+import mmap
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON từ bytes/str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize thành bytes UTF-8 (không escape ký tự tiếng Việt)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    text = json.dumps(obj, ensure_ascii=False, indent=2 if indent else None,
+                      separators=None if indent else (",", ":"))
+    return text.encode("utf-8")
+
+
+def _loads_mapped(mm: mmap.mmap) -> Any:
+    """Parse JSON từ file đã mmap, không copy sang bytes khi có orjson"""
+    if orjson is not None:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+    return json.loads(mm[:])
+
+
+def load_json(file_path) -> Any:
+    """Đọc toàn bộ file JSON"""
+    return loads(Path(file_path).read_bytes())
+
+
+def dump_jsonl(records: Iterable[Any], file_path) -> int:
+    """Ghi từng record ra một dòng (NDJSON), trả về số record đã ghi"""
+    count = 0
+    with open(file_path, 'wb') as f:
+        for rec in records:
+            f.write(dumps(rec))
+            f.write(b'\n')
+            count += 1
+    return count
+
+
+def iter_records(file_path) -> Iterator[Any]:
+    """Đọc lần lượt từng record từ file NDJSON (hoặc file JSON array kiểu cũ)"""
+    with open(file_path, 'rb') as f:
+        head = f.read(64).lstrip()
+        f.seek(0)
+        if head.startswith(b'['):
+            # định dạng cũ: cả file là một list -> mmap để orjson đọc thẳng từ page cache
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                records = _loads_mapped(mm)
+            yield from records
+            return
+        for line in f:
+            if line.strip():
+                yield loads(line)
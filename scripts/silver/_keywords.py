@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tìm nhiều từ khóa trong một lần quét text.
+Dùng Aho-Corasick (pyahocorasick) nếu đã cài; nếu không thì fallback về regex / str.find.
+Text và từ khóa đều phải được lower() trước khi đưa vào.
+"""
+
+import re
+from typing import Dict, Iterable
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]):
+        # giữ thứ tự xuất hiện của từ khóa để kết quả find() ổn định
+        self._rank = {kw: i for i, kw in enumerate(dict.fromkeys(k for k in keywords if k))}
+        self._automaton = None
+        self._any_re = None
+        if not self._rank:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for kw in self._rank:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+        else:
+            self._any_re = re.compile("|".join(map(re.escape, self._rank)))
+
+    def any_in(self, text: str) -> bool:
+        """Text có chứa ít nhất một từ khóa không"""
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        return self._any_re is not None and self._any_re.search(text) is not None
+
+    def find(self, text: str) -> Dict[str, int]:
+        """keyword -> vị trí xuất hiện đầu tiên, theo thứ tự từ khóa ban đầu"""
+        if self._automaton is None:
+            return {kw: text.find(kw) for kw in self._rank if kw in text}
+        found = {}
+        for end, kw in self._automaton.iter(text):
+            if kw not in found:
+                found[kw] = end - len(kw) + 1
+        if len(found) > 1:
+            found = dict(sorted(found.items(), key=lambda item: self._rank[item[0]]))
+        return found
@@ -5,15 +5,16 @@ Demo script cho việc sử dụng matching rules để ánh xạ từ khóa ti
 sang các class và property trong ontology
 """
 
-import json
 import re
 from typing import Dict, List, Tuple, Optional
 
+from _jsonio import load_json
+from _keywords import KeywordMatcher
+
 class MatchingRuleEngine:
     def __init__(self, rules_file: str = "matching_rules.json"):
         """Khởi tạo engine với file rules"""
-        with open(rules_file, 'r', encoding='utf-8') as f:
-            self.rules = json.load(f)
+        self.rules = load_json(rules_file)
         
         # Tạo index ngược từ keyword -> class/property
         self.keyword_to_class = {}
@@ -26,72 +27,64 @@ class MatchingRuleEngine:
         for prop_name, prop_info in self.rules["properties"].items():
             for keyword in prop_info["keywords"]:
                 self.keyword_to_property[keyword.lower()] = prop_name
+        
+        # Quét tất cả keyword trong một lần duyệt text
+        self._class_matcher = KeywordMatcher(self.keyword_to_class)
+        self._property_matcher = KeywordMatcher(self.keyword_to_property)
     
     def find_classes_in_text(self, text: str) -> List[Tuple[str, str]]:
         """
         Tìm các class trong text
         Returns: List of (keyword, class_name) tuples
         """
-        found_classes = []
-        text_lower = text.lower()
-        
-        for keyword, class_name in self.keyword_to_class.items():
-            if keyword in text_lower:
-                found_classes.append((keyword, class_name))
-        
-        return found_classes
+        found = self._class_matcher.find(text.lower())
+        return [(keyword, self.keyword_to_class[keyword]) for keyword in found]
     
     def find_properties_in_text(self, text: str) -> List[Tuple[str, str]]:
         """
         Tìm các property trong text
         Returns: List of (keyword, property_name) tuples
         """
-        found_properties = []
-        text_lower = text.lower()
-        
-        for keyword, prop_name in self.keyword_to_property.items():
-            if keyword in text_lower:
-                found_properties.append((keyword, prop_name))
-        
-        return found_properties
+        found = self._property_matcher.find(text.lower())
+        return [(keyword, self.keyword_to_property[keyword]) for keyword in found]
     
     def extract_triples(self, text: str) -> List[Dict]:
         """
         Trích xuất các triple (Subject, Predicate, Object) từ text
         """
-        classes = self.find_classes_in_text(text)
-        properties = self.find_properties_in_text(text)
+        # lower() một lần, vị trí keyword lấy luôn từ lần quét
+        text_lower = text.lower()
+        class_positions = self._class_matcher.find(text_lower)
+        prop_positions = self._property_matcher.find(text_lower)
         
         triples = []
         
         # Tạo các triple từ các class và property tìm được
-        for class_keyword, class_name in classes:
-            for prop_keyword, prop_name in properties:
-                # Tìm vị trí của keyword trong text
-                class_pos = text.lower().find(class_keyword)
-                prop_pos = text.lower().find(prop_keyword)
+        for class_keyword, class_pos in class_positions.items():
+            class_name = self.keyword_to_class[class_keyword]
+            for prop_keyword, prop_pos in prop_positions.items():
+                prop_name = self.keyword_to_property[prop_keyword]
+                
+                # Xác định subject, predicate, object dựa trên vị trí
+                if class_pos < prop_pos:
+                    # Class trước property -> Subject là class
+                    subject = self.extract_entity_around_position(text, class_pos, class_keyword)
+                    predicate = prop_name
+                    object_entity = self.extract_entity_around_position(text, prop_pos, prop_keyword)
+                else:
+                    # Property trước class -> Subject là entity xung quanh property
+                    subject = self.extract_entity_around_position(text, prop_pos, prop_keyword)
+                    predicate = prop_name
+                    object_entity = self.extract_entity_around_position(text, class_pos, class_keyword)
                 
-                if class_pos != -1 and prop_pos != -1:
-                    # Xác định subject, predicate, object dựa trên vị trí
-                    if class_pos < prop_pos:
-                        # Class trước property -> Subject là class
-                        subject = self.extract_entity_around_position(text, class_pos, class_keyword)
-                        predicate = prop_name
-                        object_entity = self.extract_entity_around_position(text, prop_pos, prop_keyword)
-                    else:
-                        # Property trước class -> Subject là entity xung quanh property
-                        subject = self.extract_entity_around_position(text, prop_pos, prop_keyword)
-                        predicate = prop_name
-                        object_entity = self.extract_entity_around_position(text, class_pos, class_keyword)
-                    
-                    triple = {
-                        "subject": subject,
-                        "predicate": predicate,
-                        "object": object_entity,
-                        "subject_type": class_name,
-                        "confidence": self.calculate_confidence(class_keyword, prop_keyword)
-                    }
-                    triples.append(triple)
+                triple = {
+                    "subject": subject,
+                    "predicate": predicate,
+                    "object": object_entity,
+                    "subject_type": class_name,
+                    "confidence": self.calculate_confidence(class_keyword, prop_keyword)
+                }
+                triples.append(triple)
         
         return triples
     
@@ -1,56 +1,86 @@
 #!/usr/bin/env python3
 import os
 import json
-from rdflib import Graph, Namespace, Literal
-from rdflib.namespace import RDF, RDFS, FOAF
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 BRONZE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../bronze/raw"))
 SILVER_DIR = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "../silver/normalized")
 )
-KG = Namespace("https://kg-football.vn/ontology#")
-RES = Namespace("https://kg-football.vn/resource/")
+RES = "https://kg-football.vn/resource/"
+
+# silver.ttl only holds type + name triples, so it is written as Turtle text
+# directly instead of going through an rdflib Graph and its serializer
+PREFIXES = (
+    "@prefix kg: <https://kg-football.vn/ontology#> .\n"
+    "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+    "@prefix foaf: <http://xmlns.com/foaf/0.1/> .\n\n"
+)
+_LITERAL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+# characters that may not appear inside a Turtle <IRI>
+_IRI_ESCAPES = str.maketrans({c: f"%{ord(c):02X}" for c in '<>"{}|^`\\'})
+
+# space, tab and no-break space all become "_" in one translate pass
+_CANON_TABLE = str.maketrans({" ": "_", "\t": "_", "\u00a0": "_"})
 
 
 def canonicalize_name(name: str) -> str:
-    return name.strip().replace(" ", "_")
+    return name.strip().translate(_CANON_TABLE)
+
+
+def page_titles(path: str) -> list:
+    """Titles of the pages in one bronze JSON file (runs in a worker process)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
+    pages = data.get("query", {}).get("pages", {})
+    # formatversion=2 responses give pages as a list, older ones as a dict keyed by pageid
+    if isinstance(pages, dict):
+        pages = pages.values()
+    return [page.get("title") for page in pages]
+
+
+def resource_iri(path: str) -> str:
+    return f"<{RES}{path.translate(_IRI_ESCAPES)}>"
+
+
+def vi_literal(text: str) -> str:
+    return f'"{text.translate(_LITERAL_ESCAPES)}"@vi'
 
 
-def build_graph_from_bronze():
-    g = Graph()
-    g.bind("kg", KG)
-    g.bind("res", RES)
-    g.bind("foaf", FOAF)
+def build_turtle_from_bronze():
+    """Yield the silver Turtle statements, one subject per line."""
+    # parse the bronze files in parallel; output is written from this process
+    files = sorted(str(p) for p in Path(BRONZE_DIR).glob("*.json"))
+    with ProcessPoolExecutor() as pool:
+        titles = [t for ts in pool.map(page_titles, files, chunksize=32) for t in ts]
 
+    seen = set()
     # Minimal demo: nếu tiêu đề có "FC" xem là Club, ngược lại là Player
-    for fn in os.listdir(BRONZE_DIR):
-        if not fn.endswith(".json"):
+    for title in titles:
+        if not title or title in seen:
             continue
-        with open(os.path.join(BRONZE_DIR, fn), encoding="utf-8") as f:
-            data = json.load(f)
-        pages = data.get("query", {}).get("pages", {})
-        for _, page in pages.items():
-            title = page.get("title")
-            if not title:
-                continue
-            if "FC" in title or "Câu lạc bộ" in title:
-                club_id = canonicalize_name(title)
-                club = RES[f"club/{club_id}"]
-                g.add((club, RDF.type, KG.Club))
-                g.add((club, RDFS.label, Literal(title, lang="vi")))
-            else:
-                pid = canonicalize_name(title)
-                player = RES[f"player/{pid}"]
-                g.add((player, RDF.type, KG.Player))
-                g.add((player, FOAF.name, Literal(title, lang="vi")))
-    return g
+        seen.add(title)
+        if "FC" in title or "Câu lạc bộ" in title:
+            club = resource_iri(f"club/{canonicalize_name(title)}")
+            yield f"{club} a kg:Club ;\n    rdfs:label {vi_literal(title)} .\n"
+        else:
+            player = resource_iri(f"player/{canonicalize_name(title)}")
+            yield f"{player} a kg:Player ;\n    foaf:name {vi_literal(title)} .\n"
 
 
 def main():
     os.makedirs(SILVER_DIR, exist_ok=True)
-    g = build_graph_from_bronze()
     out = os.path.join(SILVER_DIR, "silver.ttl")
-    g.serialize(destination=out, format="turtle")
+    with open(out, "w", encoding="utf-8") as f:
+        f.write(PREFIXES)
+        f.writelines(build_turtle_from_bronze())
     print("Wrote", out)
 
 